@@ -0,0 +1,180 @@
+import os
+import sys
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치 시 아카이브 기능만 비활성화
+    pa = None
+    ds = None
+    pq = None
+
+PARTITION_KEY = 'archive_date'
+PARTITION_FILE = 'data.parquet'
+SCHEMA_FILE = '_schema.parquet'  # '_'로 시작하는 파일은 조회 시 무시됨
+
+def get_archive_root():
+    """아카이브 루트 폴더 (ARCHIVE_DIR 환경변수 > 실행 파일/스크립트 폴더)"""
+    root = os.getenv("ARCHIVE_DIR")
+    if root:
+        return root
+    if getattr(sys, 'frozen', False):
+        base = os.path.dirname(sys.executable)
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, 'delivery_archive')
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow가 설치되어 있지 않아 Parquet 아카이브를 사용할 수 없습니다.")
+
+def _partition_dir(dataset: str, archive_date: str):
+    return os.path.join(_dataset_dir(dataset), f"{PARTITION_KEY}={archive_date}")
+
+def _dataset_dir(dataset: str):
+    return os.path.join(get_archive_root(), dataset)
+
+def _to_table(df):
+    """
+    컬럼별로 Arrow 타입 추론 (Decimal, date 등 원래 타입 유지)
+    DB 프로시저 결과의 혼합 타입 컬럼만 문자열로 변환
+    """
+    arrays = []
+    for col in df.columns:
+        try:
+            array = pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            array = pa.array(df[col].astype('string'), from_pandas=True)
+        if pa.types.is_large_string(array.type):
+            array = array.cast(pa.string())
+        arrays.append(array)
+    return pa.table(arrays, names=[str(col) for col in df.columns])
+
+def _merge_type(old, new):
+    """기존 타입과 새 타입을 모두 담을 수 있는 타입 (맞지 않으면 문자열)"""
+    if old == new or pa.types.is_null(new):
+        return old
+    if pa.types.is_null(old):
+        return new
+    if pa.types.is_integer(old) and pa.types.is_integer(new):
+        return pa.int64()
+    if pa.types.is_decimal(old) or pa.types.is_decimal(new):
+        if all(pa.types.is_decimal(t) or pa.types.is_integer(t) for t in (old, new)):
+            scale = max(t.scale for t in (old, new) if pa.types.is_decimal(t))
+            return pa.decimal128(38, scale)
+        if all(pa.types.is_decimal(t) or pa.types.is_floating(t) for t in (old, new)):
+            return pa.float64()
+        return pa.string()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (old, new)):
+        return pa.float64()
+    if pa.types.is_timestamp(old) and pa.types.is_timestamp(new) and old.tz == new.tz:
+        return pa.timestamp('us', tz=old.tz)
+    return pa.string()
+
+def _merge_schema(stored, new):
+    if stored is None:
+        return new
+    fields = []
+    for field in stored:
+        index = new.get_field_index(field.name)
+        if index < 0:
+            fields.append(field)
+        else:
+            fields.append(pa.field(field.name, _merge_type(field.type, new.field(index).type)))
+    fields += [field for field in new if stored.get_field_index(field.name) < 0]
+    return pa.schema(fields)
+
+def _read_schema(dataset: str):
+    path = os.path.join(_dataset_dir(dataset), SCHEMA_FILE)
+    return pq.read_schema(path) if os.path.exists(path) else None
+
+def _write_schema(dataset: str, schema):
+    """데이터셋 전체 스키마 저장 (조회 시 모든 파티션을 이 스키마로 변환)"""
+    path = os.path.join(_dataset_dir(dataset), SCHEMA_FILE)
+    tmp_path = os.path.join(_dataset_dir(dataset), f".{SCHEMA_FILE}.tmp")
+    pq.write_table(schema.empty_table(), tmp_path)
+    os.replace(tmp_path, path)
+
+def _cast_table(table, schema):
+    """스키마 순서/타입에 맞추고 없는 컬럼은 null로 채움"""
+    columns = [
+        table[field.name].cast(field.type) if field.name in table.column_names
+        else pa.nulls(table.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.table(columns, schema=schema)
+
+def append_to_archive(df, dataset: str, archive_date: str, replace=False, key_columns=None):
+    """
+    조회 결과를 날짜 파티션(archive_date=YYYY-MM-DD)에 저장
+    replace=True 이면 해당 일자 파티션을 교체, 아니면 기존 데이터와 합친 뒤 중복 제거
+    key_columns 지정 시 해당 컬럼(주문/픽업 ID 등) 기준으로 최신 조회 결과만 유지
+    """
+    _require_pyarrow()
+    if df.empty:
+        return None
+
+    partition_dir = _partition_dir(dataset, archive_date)
+    os.makedirs(partition_dir, exist_ok=True)
+    path = os.path.join(partition_dir, PARTITION_FILE)
+
+    table = _to_table(df.drop(columns=[PARTITION_KEY], errors='ignore'))
+    # 기존 파티션은 다시 쓰지 않고 조회 시 통합 스키마로 변환
+    schema = _merge_schema(_read_schema(dataset), table.schema)
+    table = _cast_table(table, schema)
+
+    if not replace and os.path.exists(path):
+        existing = _cast_table(ds.dataset(path, format='parquet', schema=schema).to_table(), schema)
+        merged = pa.concat_tables([existing, table]).to_pandas(types_mapper=pd.ArrowDtype)
+        merged = merged.drop_duplicates(subset=key_columns or None, keep='last')
+        table = pa.Table.from_pandas(merged, schema=schema, preserve_index=False)
+
+    # 쓰기 중 중단되어도 기존 파티션이 깨지지 않도록 임시 파일 후 교체
+    # ('.'로 시작하는 파일은 조회 시 무시됨)
+    tmp_path = os.path.join(partition_dir, f".{PARTITION_FILE}.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    _write_schema(dataset, schema)
+    return path
+
+def list_archive_dates(dataset: str):
+    """아카이브된 일자 목록"""
+    dataset_dir = _dataset_dir(dataset)
+    if not os.path.isdir(dataset_dir):
+        return []
+    prefix = f"{PARTITION_KEY}="
+    return sorted(
+        name[len(prefix):] for name in os.listdir(dataset_dir)
+        if name.startswith(prefix) and os.path.exists(os.path.join(dataset_dir, name, PARTITION_FILE))
+    )
+
+def query_archive(dataset: str, start_date=None, end_date=None, columns=None):
+    """
+    기간(YYYY-MM-DD, 양끝 포함)과 컬럼을 지정해 아카이브 조회
+    필요한 일자 파티션과 컬럼만 읽음
+    """
+    _require_pyarrow()
+    schema = _read_schema(dataset)
+    if schema is None or not list_archive_dates(dataset):
+        return pd.DataFrame(columns=(list(columns) if columns else []) + [PARTITION_KEY])
+
+    # 파티션마다 저장 당시 타입이 달라도 통합 스키마 기준으로 읽음
+    archive = ds.dataset(
+        _dataset_dir(dataset),
+        format='parquet',
+        schema=schema.append(pa.field(PARTITION_KEY, pa.string())),
+        partitioning=ds.partitioning(pa.schema([(PARTITION_KEY, pa.string())]), flavor='hive'),
+    )
+
+    condition = None
+    if start_date:
+        condition = ds.field(PARTITION_KEY) >= start_date
+    if end_date:
+        upper = ds.field(PARTITION_KEY) <= end_date
+        condition = upper if condition is None else condition & upper
+
+    if columns is not None:
+        columns = [col for col in columns if col != PARTITION_KEY] + [PARTITION_KEY]
+    return archive.to_table(columns=columns, filter=condition).to_pandas()
@@ -1,9 +1,14 @@
 import os
+import re
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from sshtunnel import SSHTunnelForwarder
 import pymysql
 from dotenv import load_dotenv
 import pandas as pd
+from archive import append_to_archive
+from profiling import profile_entry, profile_stage
 
 def resource_path(relative_path):
     """PyInstaller 호환 파일 경로"""
@@ -75,6 +80,112 @@ def get_unique_filename(base):
         counter += 1
     return base
 
+EXCEL_MAX_ROWS = 1_048_575  # 헤더 1행 제외
+SHEET_NAME = '배송데이터'
+SHARD_CONFIRM_LIMIT = 20  # 초과 시 분할 진행 여부 확인
+
+def shard_by_column(df, column):
+    """컬럼 값(지역, 배송 슬롯 등) 기준으로 분할"""
+    return [(str(key), group) for key, group in df.groupby(column, dropna=False, sort=True)]
+
+def shard_by_rows(df, rows_per_file):
+    """고정 행 수 기준으로 분할"""
+    return [
+        (f"part{i + 1:03d}", df.iloc[start:start + rows_per_file])
+        for i, start in enumerate(range(0, len(df), rows_per_file))
+    ]
+
+def write_shard(args):
+    """샤드 하나를 Excel로 저장 (프로세스 풀 작업 단위)"""
+    filename, shard_df = args
+    shard_df.to_excel(filename, index=False, sheet_name=SHEET_NAME)
+    return filename, len(shard_df)
+
+def export_shards(shards, base_name, max_workers=None):
+    """샤드를 병렬로 저장하고 인덱스(manifest) 파일 작성"""
+    jobs = []
+    reserved = set()
+    for key, shard_df in shards:
+        # 파일명에 사용할 수 없는 문자 치환
+        safe_key = re.sub(r'[\\/:*?"<>|\s]+', '_', key).strip('_') or 'empty'
+        filename = get_unique_filename(f"{base_name}_{safe_key}.xlsx")
+        counter = 1
+        # 치환 후 키가 겹치는 경우 (아직 디스크에 없는 파일명끼리 충돌)
+        while filename in reserved:
+            filename = get_unique_filename(f"{base_name}_{safe_key}_{counter}.xlsx")
+            counter += 1
+        reserved.add(filename)
+        jobs.append((key, filename, shard_df))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(write_shard, [(filename, shard_df) for _, filename, shard_df in jobs]))
+
+    manifest = pd.DataFrame(
+        [(key, filename, rows) for (key, _, _), (filename, rows) in zip(jobs, results)],
+        columns=['shard_key', 'filename', 'rows']
+    )
+    manifest_filename = get_unique_filename(f"{base_name}_index.csv")
+    manifest.to_csv(manifest_filename, index=False, encoding='utf-8-sig')
+    return manifest, manifest_filename
+
+def confirm_shard_count(shards):
+    """분할 파일 수가 많으면 진행 여부 확인"""
+    print(f"분할 파일 수: {len(shards)}개")
+    if len(shards) <= SHARD_CONFIRM_LIMIT:
+        return True
+    answer = input(f"⚠ 파일이 {SHARD_CONFIRM_LIMIT}개를 초과합니다. 계속하시겠습니까? (y/N): ").strip().lower()
+    return answer == 'y'
+
+def prompt_export_mode(df):
+    """저장 방식 선택 (단일 파일 / 컬럼 기준 분할 / 행 수 기준 분할)"""
+    too_large = len(df) > EXCEL_MAX_ROWS
+    if too_large:
+        print(f"[WARNING] 행 수({len(df)})가 Excel 최대 행 수를 초과하여 분할 저장이 필요합니다.")
+
+    print("\n저장 방식을 선택하세요.")
+    print("  1. 단일 파일")
+    print("  2. 컬럼 기준 분할 (지역, 배송 슬롯 등)")
+    print("  3. 행 수 기준 분할")
+    while True:
+        try:
+            mode = input(f"선택 (1/2/3, 기본값 {'3' if too_large else '1'}): ").strip() or ('3' if too_large else '1')
+            if mode == '1':
+                if not too_large:
+                    return None
+                print("❌ 단일 파일로 저장할 수 없습니다. 분할 방식을 선택하세요.")
+                continue
+            if mode == '2':
+                columns = [str(col) for col in df.columns]
+                print("컬럼 목록:")
+                for i, col in enumerate(columns, 1):
+                    print(f"  {i}. {col}")
+                column = input("분할 기준 컬럼명: ").strip()
+                if column.isdigit() and 1 <= int(column) <= len(columns) and column not in columns:
+                    column = columns[int(column) - 1]
+                if column not in columns:
+                    print(f"❌ 존재하지 않는 컬럼입니다: {column}")
+                    continue
+                shards = shard_by_column(df, df.columns[columns.index(column)])
+                if any(len(shard_df) > EXCEL_MAX_ROWS for _, shard_df in shards):
+                    print("❌ Excel 최대 행 수를 초과하는 분할이 있습니다. 행 수 기준 분할을 사용하세요.")
+                    continue
+                if confirm_shard_count(shards):
+                    return shards
+                continue
+            if mode == '3':
+                rows = input("파일당 행 수 (기본값 100000): ").strip() or '100000'
+                if not (rows.isdigit() and 0 < int(rows) <= EXCEL_MAX_ROWS):
+                    print(f"❌ 1 ~ {EXCEL_MAX_ROWS} 사이의 숫자를 입력하세요.")
+                    continue
+                shards = shard_by_rows(df, int(rows))
+                if confirm_shard_count(shards):
+                    return shards
+                continue
+            print("❌ 올바른 번호를 입력하세요.")
+        except KeyboardInterrupt:
+            print("\n프로그램을 종료합니다.")
+            sys.exit(0)
+
 def prompt_date():
     while True:
         try:
@@ -91,6 +202,7 @@ def prompt_date():
             print("\n프로그램을 종료합니다.")
             sys.exit(0)
 
+@profile_entry('delivery_listup')
 def main():
     if not load_env():
         input("Press Enter to exit...")
@@ -122,7 +234,9 @@ def main():
     print("데이터 조회 중...")
 
     try:
-        df = get_delivery_data(delivery_date)
+        with profile_stage('fetch') as stage:
+            df = get_delivery_data(delivery_date)
+            stage['rows'] = len(df)
     except Exception as e:
         print("❌ 데이터 조회 실패:", e)
         input("Press Enter to exit...")
@@ -133,14 +247,49 @@ def main():
         input("Press Enter to exit...")
         return
 
-    filename = get_unique_filename(f"delivery_data_{delivery_date.replace('-', '')}.xlsx")
-    df.to_excel(filename, index=False, sheet_name='배송데이터')
+    # 로컬 Parquet 아카이브 저장 (실패해도 Excel 저장은 계속 진행)
+    try:
+        archive_path = append_to_archive(df, 'delivery', delivery_date, replace=True)
+        print(f"[INFO] 아카이브 저장 완료: {archive_path}")
+    except Exception as e:
+        print(f"[WARNING] 아카이브 저장 실패: {e}")
+
+    base_name = f"delivery_data_{delivery_date.replace('-', '')}"
+    shards = prompt_export_mode(df)
+
+    if shards is None:
+        filename = get_unique_filename(f"{base_name}.xlsx")
+        with profile_stage('export') as stage:
+            df.to_excel(filename, index=False, sheet_name=SHEET_NAME)
+            stage['rows'] = len(df)
+
+        print("\n✅ 저장 완료!")
+        print(f"파일명: {filename}")
+        print(f"행 수: {len(df)}")
+        print(f"경로: {os.path.abspath(filename)}")
+        input("Press Enter to exit...")
+        return
+
+    print(f"\n{len(shards)}개 파일로 분할 저장 중...")
+    try:
+        # 작업자 프로세스 메모리가 측정되지 않으므로 단일 파일 저장과 별도 단계로 기록
+        with profile_stage('export_sharded') as stage:
+            manifest, manifest_filename = export_shards(shards, base_name)
+            stage['rows'] = len(df)
+    except Exception as e:
+        print("❌ 분할 저장 실패:", e)
+        input("Press Enter to exit...")
+        return
 
     print("\n✅ 저장 완료!")
-    print(f"파일명: {filename}")
-    print(f"행 수: {len(df)}")
-    print(f"경로: {os.path.abspath(filename)}")
+    for row in manifest.itertuples(index=False):
+        print(f"  {row.filename} ({row.rows}행)")
+    print(f"인덱스 파일: {manifest_filename}")
+    print(f"총 행 수: {manifest['rows'].sum()}")
+    print(f"경로: {os.path.abspath(os.path.dirname(manifest_filename) or '.')}")
     input("Press Enter to exit...")
 
 if __name__ == "__main__":
+    # PyInstaller 빌드 환경에서 프로세스 풀 사용 시 필요
+    multiprocessing.freeze_support()
     main()
@@ -4,6 +4,8 @@ from sshtunnel import SSHTunnelForwarder
 import pymysql
 from dotenv import load_dotenv
 import pandas as pd
+from archive import append_to_archive
+from profiling import profile_entry, profile_stage
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -148,6 +150,7 @@ def safe_exit(msg=None):
     exit(1)
 
 
+@profile_entry('listup')
 def main():
     try:
         print("=== 배송 데이터 조회 및 Excel 저장 ===")
@@ -178,16 +181,27 @@ def main():
         print("데이터를 조회 중입니다...")
 
         # 데이터 조회
-        df = get_delivery_data(delivery_date)
+        with profile_stage('fetch') as stage:
+            df = get_delivery_data(delivery_date)
+            stage['rows'] = len(df)
         if df.empty:
             print(f"{delivery_date} 배송 데이터가 없습니다.")
             input("Press Enter to exit...")
             return
 
+        # 로컬 Parquet 아카이브 저장 (실패해도 Excel 저장은 계속 진행)
+        try:
+            archive_path = append_to_archive(df, 'delivery', delivery_date, replace=True)
+            print(f"아카이브 저장 완료: {archive_path}")
+        except Exception as e:
+            print(f"WARNING: 아카이브 저장 실패: {e}")
+
         # Excel 파일로 저장 (중복 방지)
         excel_filename = f"delivery_data_{delivery_date.replace('-', '')}.xlsx"
         excel_filename = get_unique_filename(excel_filename)
-        df.to_excel(excel_filename, index=False, sheet_name='배송데이터')
+        with profile_stage('export') as stage:
+            df.to_excel(excel_filename, index=False, sheet_name='배송데이터')
+            stage['rows'] = len(df)
 
         print(f"\n=== 완료 ===")
         print(f"Excel 파일이 저장되었습니다: {excel_filename}")
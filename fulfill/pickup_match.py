@@ -4,6 +4,8 @@ from sshtunnel import SSHTunnelForwarder
 import pymysql
 from dotenv import load_dotenv
 import pandas as pd
+from archive import append_to_archive
+from profiling import profile_entry, profile_stage
 
 
 def resource_path(relative_path):
@@ -203,6 +205,89 @@ def process_address_keywords_from_input():
     return keywords
 
 
+# 원본 행과 조회 결과를 연결하는 내부 키 (사용자 파일 컬럼과 겹치지 않도록 '_' 접두사, 저장 전 제거)
+JOIN_KEY = '_search_keyword'
+
+# 아카이브 중복 제거 기준 컬럼 후보 (get_pickup_list 결과에 있는 컬럼만 사용)
+# 프로시저 컬럼명이 다르면 PICKUP_KEY_COLUMNS 환경변수에 쉼표로 구분해 지정
+PICKUP_KEY_COLUMNS = [
+    col.strip() for col in os.getenv("PICKUP_KEY_COLUMNS", "pickup_id,order_id,주문번호").split(',')
+    if col.strip()
+]
+
+
+def normalize_keyword(keyword):
+    """주소 키워드 정규화 (앞뒤 공백 제거, 연속 공백 1칸으로 통일)"""
+    if pd.isna(keyword):
+        return ""
+    return " ".join(str(keyword).split())
+
+
+def read_keyword_file(file_path: str):
+    """Excel/CSV 키워드 파일을 DataFrame으로 읽기"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in ('.xlsx', '.xlsm', '.xls'):
+        return pd.read_excel(file_path, dtype=str)
+    if ext == '.csv':
+        # Excel에서 저장한 CSV는 BOM 포함 UTF-8 또는 CP949인 경우가 많음
+        for encoding in ('utf-8-sig', 'cp949'):
+            try:
+                return pd.read_csv(file_path, dtype=str, encoding=encoding)
+            except UnicodeDecodeError:
+                continue
+        raise ValueError(f"CSV 파일 인코딩을 확인할 수 없습니다: {file_path}")
+    raise ValueError(f"지원하지 않는 파일 형식입니다 (xlsx/xls/csv만 가능): {file_path}")
+
+
+def process_address_keywords_from_file():
+    """Excel/CSV 파일에서 주소 키워드가 있는 원본 행 목록 읽기"""
+    print("\n=== 키워드 파일 입력 ===")
+
+    while True:
+        try:
+            file_path = input("키워드 파일 경로를 입력하세요 (xlsx/csv): ").strip().strip('"')
+            if not os.path.exists(file_path):
+                print(f"파일이 존재하지 않습니다: {file_path}")
+                continue
+            source_df = read_keyword_file(file_path)
+            break
+        except (KeyboardInterrupt, EOFError):
+            print("\n입력을 중단합니다.")
+            return None, None
+        except Exception as e:
+            print(f"파일 읽기 오류: {e}")
+
+    if source_df.empty:
+        print("파일에 데이터가 없습니다.")
+        return None, None
+
+    columns = [str(col) for col in source_df.columns]
+    source_df.columns = columns
+    print("컬럼 목록:")
+    for i, col in enumerate(columns, 1):
+        print(f"  {i}. {col}")
+
+    while True:
+        try:
+            column = input("주소 키워드 컬럼명을 입력하세요: ").strip()
+            # 번호로 입력한 경우도 허용
+            if column.isdigit() and 1 <= int(column) <= len(columns) and column not in columns:
+                column = columns[int(column) - 1]
+            if column in columns:
+                return source_df, column
+            print(f"존재하지 않는 컬럼입니다: {column}")
+        except (KeyboardInterrupt, EOFError):
+            print("\n입력을 중단합니다.")
+            return None, None
+
+
+def get_unique_keywords(source_df, column):
+    """정규화된 키워드 컬럼 추가 후 중복 제거된 키워드 목록 반환"""
+    source_df[JOIN_KEY] = source_df[column].map(normalize_keyword)
+    keywords = source_df[JOIN_KEY]
+    return keywords[keywords != ""].drop_duplicates().tolist()
+
+
 def safe_exit(msg=None):
     if msg:
         print(msg)
@@ -210,6 +295,7 @@ def safe_exit(msg=None):
     exit(1)
 
 
+@profile_entry('pickup_match')
 def main():
     """메인 실행 함수"""
     print("=== 주소 키워드로 픽업 데이터 조회 ===")
@@ -221,14 +307,34 @@ def main():
 
     print(f"배송일자: {delivery_date}")
 
-    # 주소 키워드 목록 입력 받기
-    address_keywords = process_address_keywords_from_input()
+    # 주소 키워드 입력 방식 선택
+    print("\n키워드 입력 방식을 선택하세요.")
+    print("  1. Excel/CSV 파일에서 읽기")
+    print("  2. 직접 붙여넣기")
+    while True:
+        input_mode = input("선택 (1/2, 기본값 1): ").strip() or "1"
+        if input_mode in ("1", "2"):
+            break
+        print("1 또는 2를 입력해주세요.")
+
+    if input_mode == "2":
+        # 붙여넣은 키워드도 파일 입력과 동일하게 원본 행으로 취급
+        source_df = pd.DataFrame({'주소': process_address_keywords_from_input()})
+        keyword_column = '주소'
+    else:
+        source_df, keyword_column = process_address_keywords_from_file()
+        if source_df is None:
+            return
+
+    # 정규화 + 중복 제거 (같은 주소는 한 번만 조회)
+    address_keywords = get_unique_keywords(source_df, keyword_column)
 
     if not address_keywords:
         print("입력된 키워드가 없습니다.")
         return
 
-    print(f"\n입력된 키워드 개수: {len(address_keywords)}")
+    print(f"\n입력된 행 개수: {len(source_df)}")
+    print(f"중복 제거 후 키워드 개수: {len(address_keywords)}")
     print("키워드 목록:")
     for i, keyword in enumerate(address_keywords, 1):
         print(f"  {i}. {keyword}")
@@ -241,39 +347,63 @@ def main():
     failed_keywords = []
 
     # 각 키워드별로 데이터 조회
-    for i, keyword in enumerate(address_keywords, 1):
-        print(f"처리 중... ({i}/{len(address_keywords)}) {keyword}")
-
-        try:
-            df = get_pickup_data_by_keyword(keyword, delivery_date)
+    with profile_stage('match') as stage:
+        for i, keyword in enumerate(address_keywords, 1):
+            print(f"처리 중... ({i}/{len(address_keywords)}) {keyword}")
+
+            try:
+                df = get_pickup_data_by_keyword(keyword, delivery_date)
+
+                if not df.empty:
+                    # 원본 행과 다시 연결하기 위한 키워드 정보 추가
+                    df[JOIN_KEY] = keyword
+                    all_results.append(df)
+                    print(f"  → {len(df)}건 조회됨")
+                else:
+                    print(f"  → 데이터 없음")
+                    failed_keywords.append(keyword)
 
-            if not df.empty:
-                # 키워드 정보 추가
-                # df['search_keyword'] = keyword
-                all_results.append(df)
-                print(f"  → {len(df)}건 조회됨")
-            else:
-                print(f"  → 데이터 없음")
+            except Exception as e:
+                print(f"  → 오류: {e}")
                 failed_keywords.append(keyword)
-
-        except Exception as e:
-            print(f"  → 오류: {e}")
-            failed_keywords.append(keyword)
+        stage['rows'] = len(address_keywords)
 
     if not all_results:
         print("\n조회된 데이터가 없습니다.")
         return
 
     # 모든 결과를 하나의 DataFrame으로 합치기
-    final_df = pd.concat(all_results, ignore_index=True)
+    result_df = pd.concat(all_results, ignore_index=True)
+
+    # 로컬 Parquet 아카이브 저장 (같은 일자의 기존 조회 결과와 합친 뒤 중복 제거)
+    # 검색 키워드는 제외해야 여러 키워드로 조회된 같은 픽업 건이 한 번만 저장됨
+    key_columns = [col for col in PICKUP_KEY_COLUMNS if col in result_df.columns]
+    if not key_columns:
+        print("WARNING: 픽업 ID 컬럼을 찾을 수 없어 전체 컬럼 기준으로 중복 제거합니다. "
+              "(PICKUP_KEY_COLUMNS 환경변수로 지정 가능)")
+    try:
+        archive_path = append_to_archive(result_df.drop(columns=JOIN_KEY), 'pickup', delivery_date,
+                                         key_columns=key_columns)
+        print(f"아카이브 저장 완료: {archive_path}")
+    except Exception as e:
+        print(f"WARNING: 아카이브 저장 실패: {e}")
+
+    if input_mode == "2":
+        # 붙여넣기 입력은 기존과 동일하게 조회 결과 컬럼만 저장
+        final_df = result_df.drop(columns=JOIN_KEY)
+    else:
+        # 원본 행 전체에 조회 결과 연결 (중복 키워드 행에도 동일 결과 반영)
+        final_df = source_df.merge(result_df, on=JOIN_KEY, how='left',
+                                   suffixes=('', '_조회')).drop(columns=JOIN_KEY)
 
     print(f"\n=== 조회 완료 ===")
-    print(f"총 조회된 데이터: {len(final_df)}건")
+    print(f"총 조회된 데이터: {len(result_df)}건")
+    print(f"원본 행과 연결된 데이터: {len(final_df)}행")
     print(f"키워드별 조회 결과:")
 
     # 키워드별 통계
-    address_column = final_df.columns[0]
-    keyword_stats = final_df.groupby(address_column).size()
+    address_column = result_df.columns[0]
+    keyword_stats = result_df.groupby(address_column).size()
     for keyword, count in keyword_stats.items():
         print(f"  {keyword}: {count}건")
         
@@ -292,7 +422,9 @@ def main():
         excel_filename = f"{base_filename}_{counter}.xlsx"
         counter += 1
 
-    final_df.to_excel(excel_filename, index=False, sheet_name='픽업데이터')
+    with profile_stage('export') as stage:
+        final_df.to_excel(excel_filename, index=False, sheet_name='픽업데이터')
+        stage['rows'] = len(final_df)
 
     print(f"\n=== 파일 저장 완료 ===")
     print(f"Excel 파일: {excel_filename}")
@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+# 사용법: PROFILE_MODE=1 또는 실행 인자 --profile
+# 기준값 저장(벤치마크 실행): PROFILE_SAVE_BASELINE=1 또는 --profile-save-baseline
+# 회귀 발견 시 종료 코드 1: PROFILE_STRICT=1 또는 --profile-strict
+# (기준값 저장/회귀 검사 옵션만 지정해도 프로파일 모드가 켜짐)
+# cProfile 핫스팟 수집: PROFILE_HOTSPOTS=1 또는 --profile-hotspots (단계 시간이 크게 늘어나므로 별도 옵션)
+# tracemalloc 메모리 측정 끄기: PROFILE_MEMORY=0 또는 --profile-no-memory (순수 처리 시간 측정용)
+DEFAULT_THRESHOLD = 0.2  # 20% 이상 악화 시 회귀
+# 처리 건수가 기준값과 ±50% 이상 다르면 비교하지 않음
+# (최대 메모리는 건수에 비례하고, 건당 시간에는 SSH 터널 연결 등 고정 비용이 섞여 있음)
+ROW_TOLERANCE = 0.5
+TOP_FUNCTIONS = 15
+
+def _flag(env_name, arg):
+    return os.getenv(env_name, "").lower() in ("1", "true", "yes") or arg in sys.argv
+
+SAVE_BASELINE = _flag("PROFILE_SAVE_BASELINE", "--profile-save-baseline")
+STRICT = _flag("PROFILE_STRICT", "--profile-strict")
+PROFILE_ENABLED = _flag("PROFILE_MODE", "--profile") or SAVE_BASELINE or STRICT
+HOTSPOTS = _flag("PROFILE_HOTSPOTS", "--profile-hotspots")
+MEMORY = (os.getenv("PROFILE_MEMORY", "1").lower() not in ("0", "false", "no")
+          and "--profile-no-memory" not in sys.argv)
+# 단계 시간 측정 중 켜져 있는 계측 (기준값과 다르면 비교 불가)
+INSTRUMENTATION = [tool for tool, enabled in (('tracemalloc', MEMORY), ('cProfile', HOTSPOTS)) if enabled]
+
+def get_profile_dir():
+    """리포트/기준값 폴더 (PROFILE_DIR 환경변수 > 실행 파일/스크립트 폴더)"""
+    root = os.getenv("PROFILE_DIR")
+    if root:
+        return root
+    if getattr(sys, 'frozen', False):
+        base = os.path.dirname(sys.executable)
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, 'profiles')
+
+def get_threshold():
+    """PROFILE_THRESHOLD (0.2 또는 20%) 해석, 잘못된 값이면 기본값 사용"""
+    value = os.getenv("PROFILE_THRESHOLD", "").strip()
+    if not value:
+        return DEFAULT_THRESHOLD
+    try:
+        threshold = float(value[:-1]) / 100 if value.endswith('%') else float(value)
+        if threshold < 0:
+            raise ValueError(value)
+        return threshold
+    except ValueError:
+        print(f"[WARNING] PROFILE_THRESHOLD 값이 올바르지 않습니다: {value} (기본값 {DEFAULT_THRESHOLD} 사용)")
+        return DEFAULT_THRESHOLD
+
+_stages = []
+
+@contextmanager
+def profile_stage(name):
+    """
+    단계별 소요 시간, 처리량, tracemalloc 최대 메모리 기록
+    처리 건수는 yield 된 dict에 stage['rows'] = n 으로 지정
+    (INSTRUMENTATION 에 있는 계측 부하가 포함된 시간)
+    """
+    stage = {'rows': 0}
+    if not PROFILE_ENABLED:
+        yield stage
+        return
+
+    if MEMORY:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    yield stage
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if MEMORY else None
+
+    rows = stage['rows']
+    _stages.append({
+        'stage': name,
+        'rows': rows,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(rows / seconds, 2) if seconds > 0 and rows else None,
+        'sec_per_row': round(seconds / rows, 6) if rows else None,
+        'peak_mb': round(peak / 1024 / 1024, 2) if peak is not None else None,
+    })
+
+def _hot_spots(profiler):
+    # 누적 시간 기준이면 main, input() 대기 등 사용자 입력 시간이 상위를 차지하므로 자체 시간 기준
+    stats = pstats.Stats(profiler)
+    entries = sorted(
+        (item for item in stats.stats.items() if item[0][2] != "<built-in method builtins.input>"),
+        key=lambda item: item[1][2], reverse=True
+    )
+    return [
+        {
+            'function': f"{os.path.basename(filename)}:{line}({func})",
+            'calls': nc,
+            'tottime': round(tt, 4),
+            'cumtime': round(ct, 4),
+        }
+        for (filename, line, func), (cc, nc, tt, ct, callers) in entries[:TOP_FUNCTIONS]
+    ]
+
+def _compare(stages, baseline):
+    """
+    기준값 대비 단계별 건당 시간/최대 메모리 악화 비율 계산
+    처리 건수 차이가 ROW_TOLERANCE 를 넘는 단계는 비교하지 않고 skipped 로 반환
+    """
+    base_stages = {stage['stage']: stage for stage in baseline.get('stages', [])}
+    threshold = get_threshold()
+    regressions = []
+    skipped = []
+    for stage in stages:
+        base = base_stages.get(stage['stage'])
+        if not base:
+            continue
+        base_rows = base.get('rows') or 0
+        if not base_rows or abs(stage['rows'] - base_rows) / base_rows > ROW_TOLERANCE:
+            skipped.append({'stage': stage['stage'], 'baseline_rows': base_rows, 'rows': stage['rows']})
+            continue
+        for metric in ('sec_per_row', 'peak_mb'):
+            current, previous = stage.get(metric), base.get(metric)
+            if not current or not previous:
+                continue
+            change = (current - previous) / previous
+            if change > threshold:
+                regressions.append({
+                    'stage': stage['stage'],
+                    'metric': metric,
+                    'baseline': previous,
+                    'current': current,
+                    'change': round(change, 4),
+                })
+    return regressions, skipped
+
+def _write_report(name, profiler):
+    profile_dir = get_profile_dir()
+    os.makedirs(profile_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report = {
+        'entry': name,
+        'timestamp': timestamp,
+        'instrumentation': INSTRUMENTATION,
+        'stages': _stages,
+        'hot_spots': _hot_spots(profiler) if profiler else [],
+    }
+
+    baseline_path = os.path.join(profile_dir, f"baseline_{name}.json")
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['baseline'] = {
+            'timestamp': baseline.get('timestamp'),
+            'rows': {stage['stage']: stage.get('rows') for stage in baseline.get('stages', [])},
+        }
+        if baseline.get('instrumentation') == INSTRUMENTATION:
+            report['regressions'], report['skipped'] = _compare(_stages, baseline)
+        else:
+            print(f"[WARNING] 기준값과 계측 옵션이 달라 비교를 건너뜁니다 "
+                  f"(기준값: {baseline.get('instrumentation')}, 현재: {INSTRUMENTATION})")
+
+    report_path = os.path.join(profile_dir, f"profile_{name}_{timestamp}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if profiler:
+        profiler.dump_stats(os.path.join(profile_dir, f"profile_{name}_{timestamp}.prof"))
+
+    if SAVE_BASELINE:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"[PROFILE] 기준값 저장: {baseline_path}")
+
+    print(f"\n=== 프로파일 결과 ({name}) ===")
+    if INSTRUMENTATION:
+        print(f"  ※ 계측({', '.join(INSTRUMENTATION)}) 부하가 포함된 시간입니다.")
+    for stage in _stages:
+        memory = f", 최대 메모리 {stage['peak_mb']}MB" if stage['peak_mb'] is not None else ""
+        print(f"  {stage['stage']}: {stage['rows']}건, {stage['seconds']}초, "
+              f"{stage['rows_per_sec']}건/초{memory}")
+    if 'baseline' in report:
+        volume = ", ".join(f"{stage} {rows}건" for stage, rows in report['baseline']['rows'].items())
+        print(f"  기준값 ({report['baseline']['timestamp']}): {volume}")
+    for skip in report.get('skipped', []):
+        print(f"  [WARNING] {skip['stage']}: 처리 건수가 기준값과 크게 달라 비교하지 않음 "
+              f"({skip['baseline_rows']}건 → {skip['rows']}건)")
+    for regression in report.get('regressions', []):
+        print(f"  ⚠ 회귀: {regression['stage']} {regression['metric']} "
+              f"{regression['baseline']} → {regression['current']} (+{regression['change']:.0%})")
+    print(f"리포트: {os.path.abspath(report_path)}")
+    return report
+
+def profile_entry(name):
+    """
+    진입점(main) 전체에 tracemalloc (+ 옵션 지정 시 cProfile) 적용
+    프로파일 모드가 아니면 원래 함수를 그대로 반환
+    (프로세스 풀 작업자의 메모리는 tracemalloc 측정 대상이 아님)
+    """
+    def decorator(func):
+        if not PROFILE_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _stages.clear()
+            if MEMORY:
+                tracemalloc.start()
+            profiler = cProfile.Profile() if HOTSPOTS else None
+            if profiler:
+                profiler.enable()
+            report = {}
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                if profiler:
+                    profiler.disable()
+                # 리포트 저장 실패가 main()의 원래 예외를 가리지 않도록 별도 처리
+                try:
+                    report = _write_report(name, profiler)
+                except Exception as e:
+                    print(f"[WARNING] 프로파일 리포트 저장 실패: {e}")
+                finally:
+                    if MEMORY:
+                        tracemalloc.stop()
+            # main()이 정상 종료된 경우에만 회귀 검사 결과로 종료 코드 결정
+            if STRICT and report.get('regressions'):
+                sys.exit(1)
+            return result
+        return wrapper
+    return decorator